@@ -1,12 +1,15 @@
+import asyncio
 import os
 import logging
-import pickle
+import shutil
+import sqlite3
+from contextlib import closing
 from pathlib import Path
 from typing import Dict, List, Any
 
 from dotenv import load_dotenv
 from utils.pdf_loader import PDFLoader
-from g_chain import RAGChain
+from g_chain import RAGChain, OpenAIServiceError
 
 # Load environment variables
 load_dotenv()
@@ -25,22 +28,24 @@ class DocumentHandler:
         self.pdf_loader = PDFLoader()
         self.rag_chain = RAGChain()
         self.processed_docs: Dict[str, Dict[str, Any]] = {}  # Tracks all processed documents
+        self._metadata_loaded = False  # Load metadata from disk at most once
 
     async def process_document(self, file_path: str, filename: str) -> bool:
         """Process a PDF document, create a vectorstore, and save metadata."""
         try:
             logger.info(f"Starting document processing for: {filename}")
 
-            # Extract and chunk text from PDF
-            text_chunks = self.pdf_loader.load_and_split(file_path)
+            # Extract and chunk text from PDF off the event loop; large PDFs
+            # take seconds and would otherwise stall every other request
+            text_chunks = await asyncio.to_thread(self.pdf_loader.load_and_split, file_path)
             if not text_chunks:
                 logger.error(f"No text extracted from {filename}")
                 return False
 
             logger.info(f"Extracted {len(text_chunks)} text chunks from {filename}")
 
-            # Create vectorstore
-            vectorstore_path = f"vectorstore/{filename}_vectorstore.pkl"
+            # Create vectorstore (saved as a directory: index.faiss + index.pkl)
+            vectorstore_path = f"vectorstore/{filename}_vectorstore"
             success = await self.rag_chain.create_vectorstore(text_chunks, vectorstore_path)
 
             if success:
@@ -50,17 +55,17 @@ class DocumentHandler:
                     "chunks_count": len(text_chunks),
                     "status": "processed"
                 }
-                self._save_metadata()
+                await asyncio.to_thread(self._save_metadata, filename)
                 logger.info(f"Successfully processed document: {filename}")
                 return True
             else:
                 logger.error(f"Failed to create vectorstore for {filename}")
                 return False
 
-        except ValueError as e:
+        except OpenAIServiceError as e:
             # Handle OpenAI-specific errors (propagate them up)
             logger.error(f"OpenAI error processing document {filename}: {str(e)}")
-            raise e
+            raise
         except Exception as e:
             logger.error(f"Error processing document {filename}: {str(e)}")
             return False
@@ -68,11 +73,11 @@ class DocumentHandler:
     async def query_document(self, question: str, filename: str = None) -> Dict[str, Any]:
         """Query a previously processed document."""
         try:
-            if not self.processed_docs:
-                self._load_metadata()
+            if not self._metadata_loaded:
+                await asyncio.to_thread(self._load_metadata)
 
             if not filename and self.processed_docs:
-                filename = list(self.processed_docs.keys())[-1]
+                filename = next(reversed(self.processed_docs))
                 logger.info(f"No filename specified, using most recent: {filename}")
 
             if not filename or filename not in self.processed_docs:
@@ -97,27 +102,67 @@ class DocumentHandler:
 
     def get_processed_documents(self) -> List[str]:
         """Return list of all processed document names."""
-        if not self.processed_docs:
+        if not self._metadata_loaded:
             self._load_metadata()
         return list(self.processed_docs.keys())
 
-    def _save_metadata(self):
-        """Persist metadata about processed documents."""
+    DB_PATH = "vectorstore/processed_docs.db"
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the metadata database, creating the table on first use."""
+        conn = sqlite3.connect(self.DB_PATH)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            "filename TEXT PRIMARY KEY, "
+            "file_path TEXT, "
+            "vectorstore_path TEXT, "
+            "chunks_count INTEGER, "
+            "status TEXT)"
+        )
+        return conn
+
+    def _save_metadata(self, filename: str):
+        """Upsert one document's metadata row (atomic, no full-file rewrite)."""
         try:
-            metadata_path = "vectorstore/processed_docs_metadata.pkl"
-            with open(metadata_path, 'wb') as f:
-                pickle.dump(self.processed_docs, f)
-            logger.info("Saved processed documents metadata.")
+            info = self.processed_docs[filename]
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO docs VALUES (?, ?, ?, ?, ?)",
+                    (filename, info["file_path"], info["vectorstore_path"],
+                     info["chunks_count"], info["status"])
+                )
+            logger.info(f"Saved metadata for document: {filename}")
         except Exception as e:
             logger.error(f"Error saving metadata: {str(e)}")
 
+    def _delete_metadata(self, filename: str):
+        """Remove one document's metadata row."""
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM docs WHERE filename = ?", (filename,))
+        except Exception as e:
+            logger.error(f"Error deleting metadata: {str(e)}")
+
     def _load_metadata(self):
         """Load metadata about previously processed documents."""
         try:
-            metadata_path = "vectorstore/processed_docs_metadata.pkl"
-            if os.path.exists(metadata_path):
-                with open(metadata_path, 'rb') as f:
-                    self.processed_docs = pickle.load(f)
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT filename, file_path, vectorstore_path, chunks_count, status "
+                    "FROM docs"
+                ).fetchall()
+
+            self.processed_docs = {
+                filename: {
+                    "file_path": file_path,
+                    "vectorstore_path": vectorstore_path,
+                    "chunks_count": chunks_count,
+                    "status": status
+                }
+                for filename, file_path, vectorstore_path, chunks_count, status in rows
+            }
+            self._metadata_loaded = True
+            if rows:
                 logger.info(f"Loaded metadata for {len(self.processed_docs)} documents.")
             else:
                 logger.info("No metadata found; starting fresh.")
@@ -134,14 +179,14 @@ class DocumentHandler:
 
             doc_info = self.processed_docs[filename]
 
-            # Remove vectorstore and original file
+            # Remove vectorstore directory and original file
             if os.path.exists(doc_info["vectorstore_path"]):
-                os.remove(doc_info["vectorstore_path"])
+                shutil.rmtree(doc_info["vectorstore_path"])
             if os.path.exists(doc_info["file_path"]):
                 os.remove(doc_info["file_path"])
 
             del self.processed_docs[filename]
-            self._save_metadata()
+            self._delete_metadata(filename)
 
             logger.info(f"Successfully deleted document: {filename}")
             return True
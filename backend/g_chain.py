@@ -1,8 +1,16 @@
+import asyncio
+import itertools
+import math
 import os
 import logging
-import pickle
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Tuple
+from uuid import uuid4
 from dotenv import load_dotenv
+import faiss
+import numpy as np
+import xxhash
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 from langchain.chains import RetrievalQA
 from langchain.prompts import PromptTemplate
@@ -10,22 +18,82 @@ from langchain.schema import Document
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 import openai
 from openai import AuthenticationError, RateLimitError, OpenAIError
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 # Load environment variables from .env
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+
+class OpenAIServiceError(Exception):
+    """OpenAI returned an error we can't work around (maps to HTTP 503)"""
+
+
+class OpenAIQuotaError(OpenAIServiceError):
+    """OpenAI quota or rate limit exhausted (maps to HTTP 429)"""
+
+
+class OpenAIAuthError(OpenAIServiceError):
+    """OpenAI rejected the API key (maps to HTTP 401)"""
+
+
+def _retry_after_or_backoff(retry_state):
+    """Honor the server's Retry-After header when present, else back off with jitter"""
+    exc = retry_state.outcome.exception()
+    response = getattr(exc, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), 60.0)
+            except ValueError:
+                pass
+    return wait_exponential_jitter(initial=1, max=30)(retry_state)
+
+
+# Shared policy for transient 429s on embedding and completion calls
+_openai_retry = retry(
+    retry=retry_if_exception_type(RateLimitError),
+    wait=_retry_after_or_backoff,
+    stop=stop_after_attempt(6),
+    reraise=True,
+)
+
+
 class RAGChain:
+    # Embedding batching: texts per API request and concurrent requests in flight
+    EMBED_BATCH_SIZE = 96
+    EMBED_CONCURRENCY = 5
+
+    # HNSW graph parameters: neighbors per node, build effort, query effort
+    HNSW_M = 32
+    HNSW_EF_CONSTRUCTION = 200
+    HNSW_EF_SEARCH = 64
+
+    # Corpora at least this large get an IVF index with int8 scalar
+    # quantization (4x smaller vectors, SIMD int8 scans); smaller corpora
+    # stay on HNSW since IVF training needs enough vectors per cluster
+    IVF_SQ_MIN_VECTORS = 4096
+    IVF_NPROBE = 8
+
     def __init__(self):
         """Initialize the RAG chain with OpenAI components"""
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
 
-        # Configure OpenAI components using the API key
+        # Configure OpenAI components using the API key.
+        # text-embedding-3-small truncated to 512 dims is far cheaper than
+        # ada-002 and cuts FAISS memory/bandwidth 3x with near-equal recall.
         self.embeddings = OpenAIEmbeddings(
             openai_api_key=self.openai_api_key,
-            model="text-embedding-ada-002"
+            model="text-embedding-3-small",
+            dimensions=512
         )
 
         self.llm = ChatOpenAI(
@@ -49,69 +117,204 @@ Answer: """,
             input_variables=["context", "question"]
         )
 
+        # LRU cache of loaded vector stores and their QA chains keyed by path,
+        # so hot documents are deserialized and wired up once per process
+        self._vs_cache: "OrderedDict[str, Tuple[float, FAISS, RetrievalQA]]" = OrderedDict()
+        self._vs_cache_size = 8
+        self._vs_cache_lock = asyncio.Lock()  # guards the cache dict and lock table
+        self._vs_load_locks: Dict[str, asyncio.Lock] = {}  # one per path, for loads
+
         logger.info("RAG Chain initialized successfully")
 
+    @_openai_retry
+    async def _embed_batch(self, batch: List[str], sem: asyncio.Semaphore) -> List[List[float]]:
+        async with sem:
+            return await self.embeddings.aembed_documents(batch)
+
+    @_openai_retry
+    async def _ainvoke_chain(self, qa_chain: RetrievalQA, question: str) -> Dict[str, Any]:
+        return await qa_chain.ainvoke({"query": question})
+
+    async def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in concurrent batches instead of one long serial stream"""
+        sem = asyncio.Semaphore(self.EMBED_CONCURRENCY)
+        batches = [
+            texts[i:i + self.EMBED_BATCH_SIZE]
+            for i in range(0, len(texts), self.EMBED_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*(self._embed_batch(batch, sem) for batch in batches))
+        return list(itertools.chain.from_iterable(results))
+
+    def _build_index(self, matrix: np.ndarray) -> faiss.Index:
+        """Pick a FAISS index for the corpus size: IVF-SQ8 for large, HNSW for small"""
+        count, dim = matrix.shape
+
+        if count >= self.IVF_SQ_MIN_VECTORS:
+            quantizer = faiss.IndexFlatL2(dim)
+            index = faiss.IndexIVFScalarQuantizer(
+                quantizer, dim,
+                int(4 * math.sqrt(count)),
+                faiss.ScalarQuantizer.QT_8bit
+            )
+            index.train(matrix)
+            index.nprobe = self.IVF_NPROBE
+        else:
+            index = faiss.IndexHNSWFlat(dim, self.HNSW_M)
+            index.hnsw.efConstruction = self.HNSW_EF_CONSTRUCTION
+            index.hnsw.efSearch = self.HNSW_EF_SEARCH
+
+        index.add(matrix)
+        return index
+
+    def _build_vectorstore(self, texts: List[str], vectors: List[List[float]]) -> FAISS:
+        """Assemble a FAISS store around a sub-linear, size-appropriate index"""
+        matrix = np.asarray(vectors, dtype='float32')
+        index = self._build_index(matrix)
+
+        ids = [str(uuid4()) for _ in texts]
+        docstore = InMemoryDocstore(
+            {doc_id: Document(page_content=text) for doc_id, text in zip(ids, texts)}
+        )
+
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=dict(enumerate(ids))
+        )
+
     async def create_vectorstore(self, text_chunks: List[str], vectorstore_path: str) -> bool:
         try:
             logger.info(f"Creating vector store with {len(text_chunks)} chunks")
-            documents = [Document(page_content=chunk) for chunk in text_chunks]
-            
+
+            # Repeated headers/footers clean up into identical chunks;
+            # embed each distinct chunk only once
+            seen = set()
+            unique_chunks = []
+            for chunk in text_chunks:
+                digest = xxhash.xxh3_64_intdigest(chunk)
+                if digest not in seen:
+                    seen.add(digest)
+                    unique_chunks.append(chunk)
+            if len(unique_chunks) < len(text_chunks):
+                logger.info(f"Deduplicated {len(text_chunks) - len(unique_chunks)} repeated chunks")
+
             # Wrap OpenAI embedding call with error handling
             try:
-                vectorstore = FAISS.from_documents(documents=documents, embedding=self.embeddings)
+                vectors = await self._embed_texts(unique_chunks)
+                # Index construction (HNSW build / IVF training) is pure CPU;
+                # keep it off the event loop like the load side
+                vectorstore = await asyncio.to_thread(
+                    self._build_vectorstore, unique_chunks, vectors
+                )
             except AuthenticationError as e:
                 logger.error(f"OpenAI Authentication Error: {str(e)}")
-                raise ValueError("OpenAI authentication failed. Please check your API key.")
+                raise OpenAIAuthError("OpenAI authentication failed. Please check your API key.")
             except RateLimitError as e:
                 logger.error(f"OpenAI Rate Limit Error: {str(e)}")
-                raise ValueError("OpenAI quota exceeded. Please try again later.")
+                raise OpenAIQuotaError("OpenAI quota exceeded. Please try again later.")
             except OpenAIError as e:
                 logger.error(f"OpenAI Error: {str(e)}")
-                raise ValueError("OpenAI service error. Please try again later.")
+                raise OpenAIServiceError("OpenAI service error. Please try again later.")
 
-            with open(vectorstore_path, 'wb') as f:
-                pickle.dump(vectorstore, f)
+            await asyncio.to_thread(vectorstore.save_local, vectorstore_path)
 
             logger.info(f"Vector store created and saved to: {vectorstore_path}")
             return True
 
-        except ValueError as e:
-            # Re-raise ValueError (our custom OpenAI errors) as-is
-            raise e
+        except OpenAIServiceError:
+            # Re-raise our OpenAI errors as-is
+            raise
         except Exception as e:
             logger.error(f"Error creating vector store: {str(e)}")
             return False
 
+    def _load_vectorstore(self, vectorstore_path: str) -> FAISS:
+        """Load a saved vector store with the raw FAISS index memory-mapped from disk"""
+        vectorstore = FAISS.load_local(
+            vectorstore_path,
+            self.embeddings,
+            allow_dangerous_deserialization=True
+        )
+
+        # Re-open the index memory-mapped so vectors are paged in on demand
+        # instead of being copied into process memory on every load
+        vectorstore.index = faiss.read_index(
+            os.path.join(vectorstore_path, "index.faiss"),
+            faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+        )
+        if isinstance(vectorstore.index, faiss.IndexHNSWFlat):
+            vectorstore.index.hnsw.efSearch = self.HNSW_EF_SEARCH
+        elif isinstance(vectorstore.index, faiss.IndexIVF):
+            vectorstore.index.nprobe = self.IVF_NPROBE
+
+        return vectorstore
+
+    def _build_chain(self, vectorstore: FAISS) -> RetrievalQA:
+        """Wire up the retrieval QA chain for a vector store once"""
+        return RetrievalQA.from_chain_type(
+            llm=self.llm,
+            chain_type="stuff",
+            retriever=vectorstore.as_retriever(
+                search_type="similarity",
+                search_kwargs={"k": 4}
+            ),
+            chain_type_kwargs={"prompt": self.prompt_template},
+            return_source_documents=True
+        )
+
+    async def _get_vectorstore(self, vectorstore_path: str) -> Tuple[FAISS, RetrievalQA]:
+        """Return a cached vector store and chain, reloading only if the file changed"""
+        # Stat index.faiss, not the directory: save_local overwrites the files
+        # in place, which does not touch the parent directory's mtime
+        mtime = os.path.getmtime(os.path.join(vectorstore_path, "index.faiss"))
+
+        async with self._vs_cache_lock:
+            cached = self._vs_cache.get(vectorstore_path)
+            if cached is not None and cached[0] == mtime:
+                self._vs_cache.move_to_end(vectorstore_path)
+                return cached[1], cached[2]
+            load_lock = self._vs_load_locks.setdefault(vectorstore_path, asyncio.Lock())
+
+        # Load under a per-path lock, off the event loop: a cold load of one
+        # store must not stall queries for stores that are already cached,
+        # while concurrent queries for the same store still load it only once
+        async with load_lock:
+            async with self._vs_cache_lock:
+                cached = self._vs_cache.get(vectorstore_path)
+                if cached is not None and cached[0] == mtime:
+                    self._vs_cache.move_to_end(vectorstore_path)
+                    return cached[1], cached[2]
+
+            vectorstore = await asyncio.to_thread(self._load_vectorstore, vectorstore_path)
+            qa_chain = self._build_chain(vectorstore)
+
+            async with self._vs_cache_lock:
+                self._vs_cache[vectorstore_path] = (mtime, vectorstore, qa_chain)
+                while len(self._vs_cache) > self._vs_cache_size:
+                    evicted, _ = self._vs_cache.popitem(last=False)
+                    self._vs_load_locks.pop(evicted, None)
+
+            return vectorstore, qa_chain
+
     async def query(self, question: str, vectorstore_path: str) -> Dict[str, Any]:
         try:
-            with open(vectorstore_path, 'rb') as f:
-                vectorstore = pickle.load(f)
+            vectorstore, qa_chain = await self._get_vectorstore(vectorstore_path)
 
             logger.info(f"Loaded vector store from: {vectorstore_path}")
 
-            qa_chain = RetrievalQA.from_chain_type(
-                llm=self.llm,
-                chain_type="stuff",
-                retriever=vectorstore.as_retriever(
-                    search_type="similarity",
-                    search_kwargs={"k": 4}
-                ),
-                chain_type_kwargs={"prompt": self.prompt_template},
-                return_source_documents=True
-            )
-
             # Wrap OpenAI LLM call with error handling
             try:
-                result = qa_chain({"query": question})
+                result = await self._ainvoke_chain(qa_chain, question)
             except AuthenticationError as e:
                 logger.error(f"OpenAI Authentication Error: {str(e)}")
-                raise ValueError("OpenAI authentication failed. Please check your API key.")
+                raise OpenAIAuthError("OpenAI authentication failed. Please check your API key.")
             except RateLimitError as e:
                 logger.error(f"OpenAI Rate Limit Error: {str(e)}")
-                raise ValueError("OpenAI quota exceeded. Please try again later.")
+                raise OpenAIQuotaError("OpenAI quota exceeded. Please try again later.")
             except OpenAIError as e:
                 logger.error(f"OpenAI Error: {str(e)}")
-                raise ValueError("OpenAI service error. Please try again later.")
+                raise OpenAIServiceError("OpenAI service error. Please try again later.")
 
             sources = []
             for doc in result.get("source_documents", []):
@@ -145,10 +348,9 @@ Answer: """,
 
     async def get_similar_chunks(self, question: str, vectorstore_path: str, k: int = 4) -> List[Dict]:
         try:
-            with open(vectorstore_path, 'rb') as f:
-                vectorstore = pickle.load(f)
+            vectorstore, _ = await self._get_vectorstore(vectorstore_path)
 
-            similar_docs = vectorstore.similarity_search(question, k=k)
+            similar_docs = await vectorstore.asimilarity_search(question, k=k)
 
             chunks = []
             for doc in similar_docs:
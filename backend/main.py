@@ -2,10 +2,11 @@ from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from dotenv import load_dotenv
+import aiofiles
 import os
-import shutil
 from pathlib import Path
 from document_handler import DocumentHandler
+from g_chain import OpenAIAuthError, OpenAIQuotaError, OpenAIServiceError
 
 import logging
 
@@ -52,8 +53,9 @@ async def process_pdf(file: UploadFile = File(...)):
             raise HTTPException(status_code=400, detail="Only PDF files are allowed")
 
         file_path = f"uploaded_files/{file.filename}"
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(1 << 20):
+                await buffer.write(chunk)
 
         logger.info(f"Processing PDF: {file.filename}")
         success = await doc_handler.process_document(file_path, file.filename)
@@ -67,15 +69,12 @@ async def process_pdf(file: UploadFile = File(...)):
         else:
             raise HTTPException(status_code=500, detail="Failed to process PDF")
 
-    except ValueError as e:
-        # Handle OpenAI-specific errors
-        error_msg = str(e)
-        if "quota exceeded" in error_msg.lower():
-            raise HTTPException(status_code=429, detail=error_msg)
-        elif "authentication" in error_msg.lower():
-            raise HTTPException(status_code=401, detail=error_msg)
-        else:
-            raise HTTPException(status_code=503, detail=error_msg)
+    except OpenAIQuotaError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except OpenAIAuthError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except OpenAIServiceError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error processing PDF: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing PDF: {str(e)}")
@@ -100,15 +99,15 @@ async def query_document(query_request: QueryRequest):
             "filename": query_request.filename
         }
 
+    except OpenAIQuotaError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except OpenAIAuthError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except OpenAIServiceError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except ValueError as e:
-        # Handle OpenAI-specific errors
-        error_dict = eval(str(e)) if str(e).startswith('{') else {"error": str(e)}
-        if "quota exceeded" in error_dict.get("error", "").lower():
-            raise HTTPException(status_code=429, detail=error_dict["error"])
-        elif "authentication" in error_dict.get("error", "").lower():
-            raise HTTPException(status_code=401, detail=error_dict["error"])
-        else:
-            raise HTTPException(status_code=503, detail=error_dict["error"])
+        # Unknown document name from query_document
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying document: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error querying document: {str(e)}")
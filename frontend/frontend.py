@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
 
 # Configure Streamlit page
@@ -15,6 +16,20 @@ st.set_page_config(
 BACKEND_URL = "http://localhost:8000"  # For local development
 
 
+@st.cache_data(ttl=10)
+def check_backend_health() -> bool:
+    """Check the backend /health endpoint, polling at most once per 10s.
+
+    Streamlit reruns the whole script on every widget interaction; without
+    the cache this would fire an HTTP call per keystroke in the chat box.
+    """
+    try:
+        response = st.session_state.http.get(f"{BACKEND_URL}/health", timeout=5)
+        return response.status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+
 class ChatInterface:
     def __init__(self):
         self.init_session_state()
@@ -26,12 +41,22 @@ class ChatInterface:
             st.session_state.current_document = None
         if "document_processed" not in st.session_state:
             st.session_state.document_processed = False
+        if "http" not in st.session_state:
+            # Keep-alive session so each rerun reuses the backend connection
+            # instead of paying a fresh TCP handshake per call
+            session = requests.Session()
+            session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+            st.session_state.http = session
 
     def upload_and_process_pdf(self, uploaded_file) -> bool:
         try:
             with st.spinner("Processing PDF..."):
-                files = {"file": uploaded_file.getvalue()}
-                response = requests.post(f"{BACKEND_URL}/process-pdf", files={"file": (uploaded_file.name, uploaded_file.getvalue(), "application/pdf")})
+                # Read the upload once; getvalue() materializes the whole file
+                data = uploaded_file.getvalue()
+                response = st.session_state.http.post(
+                    f"{BACKEND_URL}/process-pdf",
+                    files={"file": (uploaded_file.name, data, "application/pdf")}
+                )
 
                 if response.status_code == 200:
                     result = response.json()
@@ -66,7 +91,7 @@ class ChatInterface:
                 "filename": st.session_state.current_document
             }
             with st.spinner("Generating answer..."):
-                response = requests.post(f"{BACKEND_URL}/query", json=payload)
+                response = st.session_state.http.post(f"{BACKEND_URL}/query", json=payload)
 
             if response.status_code == 200:
                 return response.json()
@@ -79,18 +104,11 @@ class ChatInterface:
             st.error(f"❌ Connection error: {str(e)}")
             return None
 
-    def check_backend_health(self) -> bool:
-        try:
-            response = requests.get(f"{BACKEND_URL}/health")
-            return response.status_code == 200
-        except:
-            return False
-
     def render_sidebar(self):
         st.sidebar.title("📁 GenAI RAG Chatbot")
         st.sidebar.markdown("---")
 
-        if self.check_backend_health():
+        if check_backend_health():
             st.sidebar.success("🟢 Backend Connected")
         else:
             st.sidebar.error("🔴 Backend Disconnected")
@@ -3,14 +3,23 @@
 Test script to verify backend API functionality
 """
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 import json
 
 BACKEND_URL = "http://localhost:8000"
 
+# (connect, read) timeouts so a hung backend fails in seconds, not minutes
+TIMEOUT = (2.0, 5.0)
+
+# Shared keep-alive session so all probes reuse the same socket to the backend
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+
 def test_health_endpoint():
     """Test if backend health endpoint is working"""
     try:
-        response = requests.get(f"{BACKEND_URL}/health")
+        response = SESSION.get(f"{BACKEND_URL}/health", timeout=TIMEOUT)
         if response.status_code == 200:
             print("✅ Health endpoint working")
             print(f"Response: {response.json()}")
@@ -25,7 +34,7 @@ def test_health_endpoint():
 def test_root_endpoint():
     """Test root endpoint"""
     try:
-        response = requests.get(f"{BACKEND_URL}/")
+        response = SESSION.get(f"{BACKEND_URL}/", timeout=TIMEOUT)
         if response.status_code == 200:
             print("✅ Root endpoint working")
             print(f"Response: {response.json()}")
@@ -60,10 +69,20 @@ def main():
     print("🔍 Testing Backend API...")
     print("=" * 50)
     
-    # Test endpoints
-    health_ok = test_health_endpoint()
-    root_ok = test_root_endpoint()
-    openai_ok = test_openai_connection()
+    # The endpoint probes are independent, so run them concurrently; total
+    # wall time is the slowest probe, not the sum
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        health_future = executor.submit(test_health_endpoint)
+        root_future = executor.submit(test_root_endpoint)
+        health_ok = health_future.result()
+        root_ok = root_future.result()
+
+    # Importing RAGChain and hitting OpenAI is pointless if the backend is down
+    if health_ok and root_ok:
+        openai_ok = test_openai_connection()
+    else:
+        openai_ok = False
+        print("⏭️ Skipped OpenAI connection test (backend endpoints down)")
     
     print("\n" + "=" * 50)
     print("📊 Test Summary:")
@@ -71,6 +90,8 @@ def main():
     print(f"Root endpoint: {'✅' if root_ok else '❌'}")
     print(f"OpenAI connection: {'✅' if openai_ok else '❌'}")
     
+    SESSION.close()
+
     if health_ok and root_ok and openai_ok:
         print("\n🎉 All tests passed! Backend is ready.")
         return True